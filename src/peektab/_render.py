@@ -0,0 +1,87 @@
+from __future__ import annotations
+import sys
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+import polars as pl
+from rich.table import Table
+from rich.console import Console
+from rich import box
+
+console = Console()
+
+# -------- Rendering --------
+def render_table(df: pl.DataFrame, max_rows: int = 20, max_width: int = 120, title: Optional[str] = None):
+    if df.height > max_rows:
+        df = df.head(max_rows)
+
+    tbl = Table(
+        box=box.SIMPLE_HEAVY,
+        show_lines=False,
+        expand=False,
+        title=title,
+        pad_edge=False
+    )
+    for col in df.columns:
+        tbl.add_column(str(col), overflow="fold", no_wrap=False, justify="left")
+
+    # Convert to strings column-wise (also avoids Rich complaining about certain dtypes).
+    # Columns polars renders exactly like str() are cast in a single select, which
+    # polars evaluates across columns on its own thread pool.
+    castable = {c for c, dt in df.schema.items() if _casts_like_str(dt)}
+    cast = df.select([pl.col(c).cast(pl.String).fill_null("∅") for c in df.columns if c in castable])
+    cells = []
+    for s in df.get_columns():
+        if s.name in castable:
+            cells.append(cast.get_column(s.name).to_list())
+        else:
+            fmt = make_formatter(s.dtype)
+            cells.append([fmt(x) for x in s.to_list()])
+    for row in zip(*cells):
+        tbl.add_row(*row)
+
+    console.print(tbl, width=max_width)
+
+def _casts_like_str(dt: pl.DataType) -> bool:
+    return dt.is_integer() or dt in (pl.String, pl.Categorical, pl.Enum, pl.Date)
+
+def make_formatter(dt: pl.DataType) -> Callable[[Any], str]:
+    """Cell formatter specialized for one column dtype (same output as repr_cell)."""
+    if dt.is_float():
+        return lambda v: "∅" if v is None else f"{v:.6g}"
+    if dt.is_nested():
+        def fmt_nested(v) -> str:
+            if v is None:
+                return "∅"
+            s = str(v)
+            return s if len(s) <= 80 else s[:77] + "..."
+        return fmt_nested
+    if dt == pl.Object:
+        # arbitrary Python values; keep the generic dispatch
+        return repr_cell
+    return lambda v: "∅" if v is None else str(v)
+
+def repr_cell(val) -> str:
+    if val is None:
+        return "∅"
+    if isinstance(val, float):
+        return f"{val:.6g}"
+    if isinstance(val, (list, tuple, set, dict)):
+        s = str(val)
+        return s if len(s) <= 80 else s[:77] + "..."
+    return str(val)
+
+def print_kv(title: str, pairs: Iterable[Tuple[str, str]]):
+    if not console.is_terminal:
+        # piped output (e.g. `peektab schema f.parquet | grep ...`): plain aligned text, no Rich layout
+        pairs = list(pairs)
+        width = max((len(k) for k, _ in pairs), default=0)
+        lines = [title] + [f"{k.ljust(width)}  {v}" for k, v in pairs]
+        sys.stdout.write("\n".join(lines) + "\n")
+        return
+    console.rule(f"[bold]{title}[/bold]")
+    t = Table(box=box.SIMPLE, show_lines=False, show_header=False)
+    t.add_column("k", style="bold cyan", no_wrap=True)
+    t.add_column("v")
+    for k, v in pairs:
+        t.add_row(k, v)
+    console.print(t)
@@ -1,172 +1,227 @@
 from __future__ import annotations
 
+import argparse
 import os
-import sys
+from functools import lru_cache
 from typing import Optional, List
 
-import polars as pl
-import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich import box
+# polars/rich are imported inside the commands so `--help` and argument
+# errors stay fast; keep heavy imports out of module scope.
 
-from .utils import (
-    read_frame, scan_lazy, detect_format, sniff_delimiter,
-    render_table, print_kv,
-    is_numeric_dtype, is_utf8_dtype
-)
-
-app = typer.Typer(add_completion=False, help="peektab: inspect, summarize, and convert data in your terminal")
-console = Console()
+@lru_cache(maxsize=None)
+def _console():
+    from rich.console import Console
+    return Console()
 
 # ------------------ Commands ------------------
 
-@app.command(help="Show a neat, truncated preview of the data (head).")
-def show(
-    path: str = typer.Argument(..., help="Path to CSV/TSV, NDJSON (jsonl), or Parquet file."),
-    rows: int = typer.Option(20, "--rows", "-n", help="Number of rows to display."),
-    cols: Optional[str] = typer.Option(None, "--cols", "-c", help="Comma-separated list of columns to select."),
-    fmt: Optional[str] = typer.Option(None, "--format", "-f", help="Force format: csv|ndjson|parquet"),
-    delimiter: Optional[str] = typer.Option(None, "--delimiter", "-d", help="CSV delimiter if not comma."),
-):
+def show(path: str, rows: int = 20, cols: Optional[str] = None, fmt: Optional[str] = None, delimiter: Optional[str] = None):
+    from ._render import render_table
+    from .utils import scan_lazy
+
     lf = scan_lazy(path, fmt=fmt, delimiter=delimiter)
     if cols:
         selected = [c.strip() for c in cols.split(",") if c.strip()]
         lf = lf.select(selected)
-    df = lf.fetch(rows)
+    df = lf.head(rows).collect()
     title = f"[bold]Preview[/bold] • {os.path.basename(path)}"
     render_table(df, max_rows=rows, title=title)
-    console.print(f"[dim]rows shown: {df.height} (file preview) | columns: {len(df.columns)}[/dim]")
-
-@app.command(help="Print inferred schema with dtypes and null counts.")
-def schema(
-    path: str = typer.Argument(...),
-    fmt: Optional[str] = typer.Option(None, "--format", "-f"),
-    delimiter: Optional[str] = typer.Option(None, "--delimiter", "-d")
-):
-    df = read_frame(path, fmt=fmt, delimiter=delimiter, infer_schema_length=10_000)
-    null_df = df.null_count()
-    # row(0) returns a tuple of counts aligned to null_df.columns
-    null_counts = dict(zip(null_df.columns, null_df.row(0)))
+    _console().print(f"[dim]rows shown: {df.height} (file preview) | columns: {len(df.columns)}[/dim]")
+
+def schema(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None):
+    from ._render import print_kv
+    from .utils import scan_schema
+
+    names, dtypes, null_counts = scan_schema(path, fmt=fmt, delimiter=delimiter)
     meta = []
-    for name, dtype in zip(df.columns, df.dtypes):
+    for name, dtype in zip(names, dtypes):
         meta.append((name, f"{dtype} · nulls={int(null_counts.get(name, 0))}"))
     print_kv(f"Schema • {os.path.basename(path)}", meta)
 
-@app.command(help="Compute quick stats (numeric summary + top categories).")
-def stats(
-    path: str = typer.Argument(...),
-    topk: int = typer.Option(5, "--topk", help="Top-k categories for string/categorical columns."),
-    fmt: Optional[str] = typer.Option(None, "--format", "-f"),
-    delimiter: Optional[str] = typer.Option(None, "--delimiter", "-d")
-):
-    df = read_frame(path, fmt=fmt, delimiter=delimiter)
+def stats(path: str, topk: int = 5, fmt: Optional[str] = None, delimiter: Optional[str] = None):
+    import polars as pl
+    from rich.panel import Panel
+    from ._render import render_table
+    from .utils import scan_lazy, is_numeric_dtype, is_utf8_dtype
+
+    lf = scan_lazy(path, fmt=fmt, delimiter=delimiter, parse_dates=True)
+    schema = lf.collect_schema()
+    num_cols = [c for c, dt in schema.items() if is_numeric_dtype(dt)]
+    str_cols = [c for c, dt in schema.items() if is_utf8_dtype(dt)]
+    # only decode the columns we summarize (projection pushdown)
+    df = lf.select(num_cols + str_cols).collect()
 
     # Numeric summary
-    num_cols = [c for c, dt in zip(df.columns, df.dtypes) if is_numeric_dtype(dt)]
     if num_cols:
+        # one multi-column expression per aggregate instead of one per column
         summary = df.select([
             pl.len().alias("count"),
-            *[pl.col(c).mean().alias(f"{c}_mean") for c in num_cols],
-            *[pl.col(c).std().alias(f"{c}_std") for c in num_cols],
-            *[pl.col(c).min().alias(f"{c}_min") for c in num_cols],
-            *[pl.col(c).max().alias(f"{c}_max") for c in num_cols],
+            pl.col(num_cols).mean().name.suffix("_mean"),
+            pl.col(num_cols).std().name.suffix("_std"),
+            pl.col(num_cols).min().name.suffix("_min"),
+            pl.col(num_cols).max().name.suffix("_max"),
         ])
         render_table(summary, title="[bold]Numeric summary[/bold]")
     else:
-        console.print(Panel.fit("No numeric columns detected.", border_style="yellow"))
+        _console().print(Panel.fit("No numeric columns detected.", border_style="yellow"))
 
     # Categorical peek (most frequent values)
-    str_cols = [c for c, dt in zip(df.columns, df.dtypes) if is_utf8_dtype(dt)]
-    for c in str_cols:
-        freq = (
-            df.select(pl.col(c))
-              .drop_nulls()
-              .group_by(c)                 # <-- correct API
-              .len()
-              .sort("len", descending=True)
-              .head(topk)
-        )
+    # one lazy query per column, executed together on polars' thread pool
+    freqs = pl.collect_all([
+        df.lazy()
+          .select(pl.col(c))
+          .filter(pl.col(c).is_not_null())
+          .group_by(c)
+          .len()
+          .sort("len", descending=True)
+          .head(topk)
+        for c in str_cols
+    ])
+    for c, freq in zip(str_cols, freqs):
         if freq.height:
             render_table(freq, title=f"[bold]Top {topk} values[/bold] • {c}")
 
-@app.command(help="Sample random rows.")
-def sample(
-    path: str = typer.Argument(...),
-    n: int = typer.Option(10, "--n"),
-    seed: Optional[int] = typer.Option(42, "--seed"),
-    fmt: Optional[str] = typer.Option(None, "--format", "-f"),
-    delimiter: Optional[str] = typer.Option(None, "--delimiter", "-d"),
-):
-    df = read_frame(path, fmt=fmt, delimiter=delimiter)
-    n = min(n, df.height) if df.height else 0
+def sample(path: str, n: int = 10, seed: Optional[int] = 42, fmt: Optional[str] = None, delimiter: Optional[str] = None):
+    import random
+    from rich.panel import Panel
+    from ._render import render_table
+    from .utils import fast_row_count, take_rows
+
+    height = fast_row_count(path, fmt=fmt, delimiter=delimiter)
+    n = min(n, height) if height else 0
     if n == 0:
-        console.print(Panel.fit("Empty dataset.", border_style="red"))
-        raise typer.Exit(1)
-    s = df.sample(n=n, seed=seed) if seed is not None else df.sample(n=n)
+        _console().print(Panel.fit("Empty dataset.", border_style="red"))
+        raise SystemExit(1)
+    # pick row indices up front so only the sampled rows are materialized
+    picks = random.Random(seed).sample(range(height), n)
+    s = take_rows(path, picks, fmt=fmt, delimiter=delimiter)
     render_table(s, max_rows=n, title=f"[bold]Random sample ({n})[/bold] • {os.path.basename(path)}")
 
-@app.command(help="List columns.")
-def columns(
-    path: str = typer.Argument(...),
-    fmt: Optional[str] = typer.Option(None, "--format", "-f"),
-    delimiter: Optional[str] = typer.Option(None, "--delimiter", "-d")
-):
-    df = read_frame(path, fmt=fmt, delimiter=delimiter, infer_schema_length=10_000)
-    pairs = [(c, str(dt)) for c, dt in zip(df.columns, df.dtypes)]
+def columns(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None):
+    from ._render import print_kv
+    from .utils import read_schema
+
+    schema = read_schema(path, fmt=fmt, delimiter=delimiter)
+    pairs = [(c, str(dt)) for c, dt in schema.items()]
     print_kv(f"Columns • {os.path.basename(path)}", pairs)
 
-@app.command(help="Convert between formats (csv <-> parquet <-> ndjson).")
-def convert(
-    src: str = typer.Argument(..., help="Source file"),
-    dst: str = typer.Argument(..., help="Destination file (.csv/.parquet/.jsonl)"),
-    fmt_src: Optional[str] = typer.Option(None, "--from-format", "-F", help="csv|parquet|ndjson"),
-    fmt_dst: Optional[str] = typer.Option(None, "--to-format", "-T", help="csv|parquet|ndjson"),
-    delimiter: Optional[str] = typer.Option(None, "--delimiter", "-d", help="Delimiter for CSV output, default comma"),
-):
-    df = read_frame(src, fmt=fmt_src)
+def convert(src: str, dst: str, fmt_src: Optional[str] = None, fmt_dst: Optional[str] = None, delimiter: Optional[str] = None, streaming: bool = True):
+    from .utils import read_frame, scan_lazy
+
     out_fmt = fmt_dst or os.path.splitext(dst)[1].lower().lstrip(".")
     out_fmt = {"jsonl": "ndjson", "pq": "parquet"}.get(out_fmt, out_fmt)
-
-    if out_fmt == "csv":
-        sep = delimiter or ","
-        df.write_csv(dst, separator=sep)
-    elif out_fmt == "parquet":
-        df.write_parquet(dst)
-    elif out_fmt == "ndjson":
-        df.write_ndjson(dst)
+    if out_fmt not in ("csv", "parquet", "ndjson"):
+        _console().print(f"[red]Unsupported destination format: {out_fmt}[/red]")
+        raise SystemExit(2)
+
+    if streaming:
+        # sink_* executes the scan in batches; the full frame is never held in memory
+        lf = scan_lazy(src, fmt=fmt_src, parse_dates=True)
+        if out_fmt == "csv":
+            lf.sink_csv(dst, separator=delimiter or ",")
+        elif out_fmt == "parquet":
+            lf.sink_parquet(dst)
+        else:
+            lf.sink_ndjson(dst)
     else:
-        console.print(f"[red]Unsupported destination format: {out_fmt}[/red]")
-        raise typer.Exit(2)
-    console.print(f"[green]Wrote[/green] {dst}")
-
-@app.command(help="Quick info: rows, columns, file format, delimiter (if CSV), and memory footprint.")
-def info(
-    path: str = typer.Argument(...),
-    fmt: Optional[str] = typer.Option(None, "--format", "-f"),
-    delimiter: Optional[str] = typer.Option(None, "--delimiter", "-d")
-):
-    actual_fmt = detect_format(path, fmt)
-    used_delim = delimiter
-    if actual_fmt == "csv" and used_delim is None:
-        used_delim = sniff_delimiter(path)
-    lf = scan_lazy(path, fmt=fmt, delimiter=used_delim)
-    df = lf.fetch(0)  # get columns fast
-    n = lf.select(pl.len()).collect().item()
-    mem_est = "--"
-    try:
-        mem_est = f"{sum([c.estimated_size() for c in df.iter_columns()]) / (1024**2):.2f} MiB (columns only)"
-    except Exception:
-        pass
+        df = read_frame(src, fmt=fmt_src, parse_dates=True)
+        if out_fmt == "csv":
+            df.write_csv(dst, separator=delimiter or ",")
+        elif out_fmt == "parquet":
+            df.write_parquet(dst)
+        else:
+            df.write_ndjson(dst)
+    _console().print(f"[green]Wrote[/green] {dst}")
+
+def info(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None):
+    from ._render import print_kv
+    from .utils import scan_lazy, fast_row_count, resolve_format, parquet_meta
+
+    actual_fmt, used_delim = resolve_format(path, fmt, delimiter)
+    meta = parquet_meta(path) if actual_fmt == "parquet" else None
+    if meta is not None:
+        # footer metadata only, no polars plan
+        n, n_cols = meta["num_rows"], meta["num_cols"]
+        mem_est = f"{meta['total_byte_size'] / (1024**2):.2f} MiB (uncompressed)"
+    else:
+        lf = scan_lazy(path, fmt=actual_fmt, delimiter=used_delim)
+        n_cols = len(lf.collect_schema())  # plan metadata only, no rows read
+        n = fast_row_count(path, fmt=actual_fmt, delimiter=used_delim)
+        mem_est = "--"
+        if os.path.isfile(path):  # globs / remote URLs have no single on-disk size
+            mem_est = f"{os.path.getsize(path) / (1024**2):.2f} MiB (on disk)"
     pairs = [
         ("file", os.path.basename(path)),
         ("format", actual_fmt),
         ("delimiter", used_delim or "—"),
         ("rows", str(n)),
-        ("columns", str(len(df.columns))),
+        ("columns", str(n_cols)),
         ("mem_est", mem_est),
     ]
     print_kv("Info", pairs)
 
+# ------------------ Entry point ------------------
+
+def _format_options(p: argparse.ArgumentParser):
+    p.add_argument("--format", "-f", dest="fmt", help="Force format: csv|ndjson|parquet")
+    p.add_argument("--delimiter", "-d", help="CSV delimiter if not comma.")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="peektab", description="peektab: inspect, summarize, and convert data in your terminal")
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    p = sub.add_parser("show", help="Show a neat, truncated preview of the data (head).")
+    p.add_argument("path", help="Path to CSV/TSV, NDJSON (jsonl), or Parquet file.")
+    p.add_argument("--rows", "-n", type=int, default=20, help="Number of rows to display.")
+    p.add_argument("--cols", "-c", help="Comma-separated list of columns to select.")
+    _format_options(p)
+    p.set_defaults(func=show)
+
+    p = sub.add_parser("schema", help="Print inferred schema with dtypes and null counts.")
+    p.add_argument("path")
+    _format_options(p)
+    p.set_defaults(func=schema)
+
+    p = sub.add_parser("stats", help="Compute quick stats (numeric summary + top categories).")
+    p.add_argument("path")
+    p.add_argument("--topk", type=int, default=5, help="Top-k categories for string/categorical columns.")
+    _format_options(p)
+    p.set_defaults(func=stats)
+
+    p = sub.add_parser("sample", help="Sample random rows.")
+    p.add_argument("path")
+    p.add_argument("--n", type=int, default=10)
+    p.add_argument("--seed", type=int, default=42)
+    _format_options(p)
+    p.set_defaults(func=sample)
+
+    p = sub.add_parser("columns", help="List columns.")
+    p.add_argument("path")
+    _format_options(p)
+    p.set_defaults(func=columns)
+
+    p = sub.add_parser("convert", help="Convert between formats (csv <-> parquet <-> ndjson).")
+    p.add_argument("src", help="Source file")
+    p.add_argument("dst", help="Destination file (.csv/.parquet/.jsonl)")
+    p.add_argument("--from-format", "-F", dest="fmt_src", metavar="FMT", help="csv|parquet|ndjson")
+    p.add_argument("--to-format", "-T", dest="fmt_dst", metavar="FMT", help="csv|parquet|ndjson")
+    p.add_argument("--delimiter", "-d", help="Delimiter for CSV output, default comma")
+    p.add_argument("--streaming", action=argparse.BooleanOptionalAction, default=True,
+                   help="Stream rows to the destination instead of loading the whole file.")
+    p.set_defaults(func=convert)
+
+    p = sub.add_parser("info", help="Quick info: rows, columns, file format, delimiter (if CSV), and memory footprint.")
+    p.add_argument("path")
+    _format_options(p)
+    p.set_defaults(func=info)
+
+    return parser
+
+def main(argv: Optional[List[str]] = None):
+    args = vars(build_parser().parse_args(argv))
+    args.pop("command")
+    func = args.pop("func")
+    func(**args)
+
 if __name__ == "__main__":
-    app()
+    main()
@@ -1,14 +1,11 @@
 from __future__ import annotations
 import os
-import sys
-from typing import Iterable, Optional, Tuple
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
 
 import polars as pl
-from rich.table import Table
-from rich.console import Console
-from rich import box
-
-console = Console()
 
 # -------- File loading --------
 def detect_format(path: str, fmt: Optional[str]) -> str:
@@ -24,17 +21,23 @@ def detect_format(path: str, fmt: Optional[str]) -> str:
     # fallback try csv
     return "csv"
 
-def read_frame(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None, infer_schema_length: int = 2048) -> pl.DataFrame:
+@lru_cache(maxsize=32)
+def resolve_format(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None) -> Tuple[str, Optional[str]]:
+    """Decide (format, delimiter) once per path; csv delimiters are sniffed if not given."""
     fmt = detect_format(path, fmt)
+    if fmt == "csv" and delimiter is None:
+        delimiter = sniff_delimiter(path)
+    return fmt, delimiter
+
+def read_frame(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None, infer_schema_length: int = 2048, parse_dates: bool = False) -> pl.DataFrame:
+    fmt, delimiter = resolve_format(path, fmt, delimiter)
     if fmt == "csv":
-        # auto-delimiter if not provided
-        if delimiter is None:
-            delimiter = sniff_delimiter(path)
         return pl.read_csv(
             path,
             separator=delimiter,
             infer_schema_length=infer_schema_length,
-            try_parse_dates=True
+            # date detection runs on every string value; only pay for it when asked
+            try_parse_dates=parse_dates
         )
     elif fmt == "ndjson":
         return pl.read_ndjson(path)
@@ -43,12 +46,15 @@ def read_frame(path: str, fmt: Optional[str] = None, delimiter: Optional[str] =
     else:
         raise ValueError(f"Unsupported format: {fmt}")
 
-def scan_lazy(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None) -> pl.LazyFrame:
-    fmt = detect_format(path, fmt)
+def scan_lazy(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None, infer_schema_length: int = 2048, parse_dates: bool = False) -> pl.LazyFrame:
+    fmt, delimiter = resolve_format(path, fmt, delimiter)
     if fmt == "csv":
-        if delimiter is None:
-            delimiter = sniff_delimiter(path)
-        return pl.scan_csv(path, separator=delimiter, try_parse_dates=True)
+        return pl.scan_csv(
+            path,
+            separator=delimiter,
+            infer_schema_length=infer_schema_length,
+            try_parse_dates=parse_dates
+        )
     elif fmt == "ndjson":
         return pl.scan_ndjson(path)
     elif fmt == "parquet":
@@ -56,72 +62,141 @@ def scan_lazy(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = N
     else:
         raise ValueError(f"Unsupported format: {fmt}")
 
+def read_schema(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None, infer_schema_length: int = 10_000) -> Dict[str, pl.DataType]:
+    fmt, delimiter = resolve_format(path, fmt, delimiter)
+    if fmt == "parquet":
+        # footer only; no LazyFrame/plan needed
+        return dict(pl.read_parquet_schema(path))
+    lf = scan_lazy(path, fmt=fmt, delimiter=delimiter, infer_schema_length=infer_schema_length)
+    return dict(lf.collect_schema())
+
+def scan_schema(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None, infer_schema_length: int = 10_000) -> Tuple[List[str], List[pl.DataType], Dict[str, int]]:
+    """Return (columns, dtypes, null_counts) without materializing the frame."""
+    fmt, delimiter = resolve_format(path, fmt, delimiter)
+    meta = parquet_meta(path) if fmt == "parquet" else None
+    if meta is not None and meta["null_counts"] is not None:
+        schema = read_schema(path, fmt=fmt)
+        return list(schema), list(schema.values()), meta["null_counts"]
+    # one scan: schema from the plan, null counts from a single aggregation pass over it
+    lf = scan_lazy(path, fmt=fmt, delimiter=delimiter, infer_schema_length=infer_schema_length)
+    schema = lf.collect_schema()
+    names = schema.names()
+    null_row = lf.select(pl.all().null_count()).collect().row(0)
+    return names, schema.dtypes(), dict(zip(names, null_row))
+
+def _open_parquet(path: str):
+    """pyarrow ParquetFile for a single local file, else None.
+
+    Globs and remote URLs (which polars accepts) and a missing pyarrow all
+    return None so callers fall back to the polars scan.
+    """
+    if not os.path.isfile(path):
+        return None
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return pq.ParquetFile(path)
+
+def parquet_meta(path: str) -> Optional[dict]:
+    """Parquet footer metadata via pyarrow, or None when it is not available for `path`.
+
+    ``null_counts`` is summed from row-group statistics and is None when the
+    schema is nested or any column chunk lacks a null count.
+    """
+    pf = _open_parquet(path)
+    if pf is None:
+        return None
+    md = pf.metadata
+    names = pf.schema_arrow.names
+    row_groups = [md.row_group(i) for i in range(md.num_row_groups)]
+
+    null_counts: Optional[Dict[str, int]] = None
+    leaves = [md.schema.column(j).path for j in range(md.num_columns)]
+    if leaves == names:
+        null_counts = dict.fromkeys(names, 0)
+        for rg in row_groups:
+            for j, name in enumerate(names):
+                st = rg.column(j).statistics
+                if st is None or not st.has_null_count:
+                    null_counts = None
+                    break
+                null_counts[name] += st.null_count
+            if null_counts is None:
+                break
+
+    return {
+        "num_rows": md.num_rows,
+        "num_cols": len(names),
+        "row_groups": md.num_row_groups,
+        "total_byte_size": sum(rg.total_byte_size for rg in row_groups),
+        "null_counts": null_counts,
+    }
+
+def fast_row_count(path: str, fmt: Optional[str] = None, delimiter: Optional[str] = None) -> int:
+    """Row count without parsing values.
+
+    A bare ``len()`` on a scan hits polars' dedicated count paths: the parquet
+    footer, and a multi-threaded, quote-aware newline count for csv/ndjson.
+    """
+    lf = scan_lazy(path, fmt=fmt, delimiter=delimiter)
+    return lf.select(pl.len()).collect().item()
+
+def take_rows(path: str, rows: List[int], fmt: Optional[str] = None, delimiter: Optional[str] = None) -> pl.DataFrame:
+    """Materialize only the given (distinct) row positions, in the order given."""
+    fmt, delimiter = resolve_format(path, fmt, delimiter)
+    df = _take_parquet_rows(path, rows) if fmt == "parquet" else None
+    if df is None:
+        lf = scan_lazy(path, fmt=fmt, delimiter=delimiter)
+        df = (
+            lf.with_row_index("__peektab_row")
+              .filter(pl.col("__peektab_row").is_in(rows))
+              .drop("__peektab_row")
+              .collect()
+        )
+    # both readers yield file order; put the rows back in the requested order
+    rank = {r: i for i, r in enumerate(sorted(rows))}
+    return df.select(pl.all().gather([rank[r] for r in rows]))
+
+def _take_parquet_rows(path: str, rows: List[int]) -> Optional[pl.DataFrame]:
+    # decode only the row groups that hold a requested row (needs pyarrow for row-group access)
+    pf = _open_parquet(path)
+    if pf is None:
+        return None
+    md = pf.metadata
+    starts = list(accumulate((md.row_group(i).num_rows for i in range(md.num_row_groups)), initial=0))
+    by_group: Dict[int, List[int]] = {}
+    for r in sorted(rows):
+        g = bisect_right(starts, r) - 1
+        by_group.setdefault(g, []).append(r - starts[g])
+    parts = [
+        pl.from_arrow(pf.read_row_group(g)).select(pl.all().gather(offsets))
+        for g, offsets in by_group.items()
+    ]
+    return pl.concat(parts)
+
 def sniff_delimiter(path: str) -> str:
-    # very small heuristic: look at first non-empty line
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            line = line.strip()
-
-            if not line:
-                continue
-            counts = {",": line.count(","), "\t": line.count("\t"), ";": line.count(";")}
-            return max(counts, key=counts.get) if any(counts.values()) else ","
+    # very small heuristic: look at first non-empty line.
+    # Work on raw bytes so we never decode the file (bytes.count is a C-level scan).
+    with open(path, "rb") as f:
+        buf = f.read(65536)
+    for line in buf.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        counts = {",": line.count(b","), "\t": line.count(b"\t"), ";": line.count(b";")}
+        return max(counts, key=counts.get) if any(counts.values()) else ","
     return ","
 
-# -------- Rendering --------
-def render_table(df: pl.DataFrame, max_rows: int = 20, max_width: int = 120, title: Optional[str] = None):
-    if df.height > max_rows:
-        df = df.head(max_rows)
-
-    tbl = Table(
-        box=box.SIMPLE_HEAVY,
-        show_lines=False,
-        expand=False,
-        title=title,
-        pad_edge=False
-    )
-    for col in df.columns:
-        tbl.add_column(str(col), overflow="fold", no_wrap=False, justify="left")
-
-    # Convert to strings to avoid Rich complaining about certain dtypes
-    for row in df.iter_rows():
-        tbl.add_row(*[repr_cell(x) for x in row])
-
-    console.print(tbl, width=max_width)
-
-def repr_cell(val) -> str:
-    if val is None:
-        return "∅"
-    if isinstance(val, float):
-        return f"{val:.6g}"
-    if isinstance(val, (list, tuple, set, dict)):
-        s = str(val)
-        return s if len(s) <= 80 else s[:77] + "..."
-    return str(val)
-
-def print_kv(title: str, pairs: Iterable[Tuple[str, str]]):
-    console.rule(f"[bold]{title}[/bold]")
-    t = Table(box=box.SIMPLE, show_lines=False, show_header=False)
-    t.add_column("k", style="bold cyan", no_wrap=True)
-    t.add_column("v")
-    for k, v in pairs:
-        t.add_row(k, v)
-    console.print(t)
-
-NUMERIC_DTYPES = {
+NUMERIC_DTYPES = frozenset({
     pl.Int8, pl.Int16, pl.Int32, pl.Int64,
     pl.UInt8, pl.UInt16, pl.UInt32, pl.UInt64,
     pl.Float32, pl.Float64,
-}
+})
 
-try:
-    NUMERIC_DTYPES.add(pl.Decimal)  # dtype comparison works by base type
-except Exception:
-    pass
-    
 def is_numeric_dtype(dt) -> bool:
-    # handle Decimal with precision/scale where direct equality may differ
-    return (dt in NUMERIC_DTYPES) or ("Decimal" in repr(dt))
+    # Decimal carries precision/scale, so match on its base type rather than equality
+    return dt in NUMERIC_DTYPES or dt.base_type() == pl.Decimal
 
 def is_utf8_dtype(dt) -> bool:
     return dt == pl.Utf8